@@ -13,6 +13,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 🔥 다음 시간대 인기 역 캐시 예열 (서버당 한 번만 시작)
+logic.start_warmup_scheduler()
+
 # ==========================================
 # 2. UI 그리기 함수 (화면 담당)
 # ==========================================
@@ -77,20 +80,14 @@ def show_survival_report(congestion_score, ref_text, air_df, temp, humi):
 # (2) 대시보드 차트 화면
 def show_congestion_chart(station_name):
     now = datetime.now()
-    weekday = now.weekday()
-    day_type = "평일" if weekday <= 4 else ("토요일" if weekday == 5 else "일요일")
-    clean_name = station_name.replace("역", "")
-    
-    # 🌟 logic 파일의 데이터 사용!
-    df = logic.df_congestion
+    day_type, _ = logic.get_time_slot(now)
     
-    condition = (df['출발역'] == clean_name) & (df['요일구분'] == day_type)
-    rows = df[condition]
+    # 🌟 logic 파일의 (캐시된) 데이터 사용!
+    chart_data = logic.get_congestion_profile(station_name, day_type)
     
-    if rows.empty: return
+    if chart_data.empty: return
 
-    time_cols = [c for c in df.columns if "시" in c and "분" in c]
-    chart_data = rows[time_cols].max()
+    time_cols = list(chart_data.index)
     
     st.markdown("### 📊 한눈에 보는 혼잡도 브리핑")
     
@@ -125,6 +122,22 @@ def show_congestion_chart(station_name):
         table_df.columns = ["시간", "혼잡도(%)"]
         st.dataframe(table_df, use_container_width=True, hide_index=True)
 
+# (3) 캐시 예열 현황 (사이드바)
+def show_cache_metrics():
+    metrics = logic.get_cache_metrics()
+    with st.expander("⚡ 캐시 예열 현황"):
+        st.metric("예측 적중률", f"{metrics['predicted_rate'] * 100:.0f}%", f"요청 {metrics['requests']}건", delta_color="off")
+        for label, kind in [("혼잡도", "congestion"), ("대기 정보", "air")]:
+            rate = metrics["cache_hit_rate"][kind]
+            st.caption(f"{label} 캐시 적중률: {rate * 100:.0f}%" if rate is not None else f"{label} 캐시 적중률: -")
+        for label, key in [("첫 요청 (전부 캐시)", "first_warm_ms"), ("첫 요청 (API 호출 발생)", "first_cold_ms")]:
+            value = metrics[key]
+            st.caption(f"{label}: {value:.0f} ms" if value is not None else f"{label}: -")
+        if metrics["warmup_error"]:
+            st.caption(f"⚠️ 마지막 예열 실패: {metrics['warmup_error']}")
+        elif metrics["warmup_last_run"]:
+            st.caption(f"마지막 예열: {metrics['warmup_last_run']:%H:%M:%S} ({metrics['warmup_stations']}개 역)")
+
 # ==========================================
 # 3. 메인 실행 (UI 배치)
 # ==========================================
@@ -138,12 +151,17 @@ with st.sidebar:
     st.divider()
     st.caption("Developed by 용용 & Dr.Seol")
 
+    # 이번 요청까지 반영되도록 맨 마지막에 채움
+    metrics_box = st.empty()
+
 if run_btn:
-    # 🌟 logic 함수 호출!
+    # 🌟 logic 함수 호출! (걸린 시간은 예열 효과 측정용)
+    started = logic.begin_access()
     congestion, ref_time = logic.get_real_congestion(station)
     air_df = logic.get_gu_air_quality(station)
     arrival_df = logic.get_arrival(station)
     temp, humi = logic.get_weather_info(station)
+    logic.record_access(station, started)
 
     col1, col2 = st.columns([1, 1])
     with col1:
@@ -163,4 +181,7 @@ if run_btn:
 
 else:
     st.markdown("### 👋 환영합니다!")
-    st.write("왼쪽 사이드바에서 역 이름을 입력하고 **[분석 시작]**을 눌러주세요.")
\ No newline at end of file
+    st.write("왼쪽 사이드바에서 역 이름을 입력하고 **[분석 시작]**을 눌러주세요.")
+
+with metrics_box.container():
+    show_cache_metrics()
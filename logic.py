@@ -1,7 +1,13 @@
 import streamlit as st
 import pandas as pd
 import requests
-from datetime import datetime
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
 # ==========================================
 # 1. 족보 (매핑 테이블)
@@ -38,54 +44,103 @@ df_congestion = load_data()
 # 3. 핵심 기능 (계산 로직들)
 # ==========================================
 
-# (1) 혼잡도 계산
-def get_real_congestion(station_name):
-    now = datetime.now()
+# (0) 현재 요일/시간대 구하기 (30분 단위)
+def get_time_slot(now=None):
+    now = now or datetime.now()
     weekday = now.weekday()
     day_type = "평일" if weekday <= 4 else ("토요일" if weekday == 5 else "일요일")
-    
-    hour = now.hour
-    minute = now.minute
-    time_col = f"{hour}시00분" if minute < 30 else f"{hour}시30분"
-    
-    if time_col not in df_congestion.columns:
-        return 0, f"{day_type} {time_col} (운행종료)"
+    time_col = f"{now.hour}시00분" if now.minute < 30 else f"{now.hour}시30분"
+    return day_type, time_col
+
+# 캐시 적중 측정용: 요청마다 어떤 데이터를 찾았고(requested), 그중 무엇을 실제로 새로 불러왔는지(fetched) 기록
+# st.cache_data는 캐시가 없을 때만 함수 본문을 실행하므로 본문 안에서 표시하면 실제 미스만 잡힘
+CACHE_KINDS = ("congestion", "air")
+_fetch_flags = threading.local()
 
-    clean_name = station_name.replace("역", "")
+def _mark(flag, kind):
+    kinds = getattr(_fetch_flags, flag, None)
+    if kinds is not None:  # begin_access()를 부른 스레드(사용자 요청)만 집계
+        kinds.add(kind)
+
+# (1) 혼잡도 계산
+@st.cache_data(show_spinner=False)
+def _congestion_profile(clean_name, day_type):
+    # 역+요일별 시간대 혼잡도 (차트/추천에서 같이 씀)
+    _mark("fetched", "congestion")
     condition = (df_congestion['출발역'] == clean_name) & (df_congestion['요일구분'] == day_type)
     rows = df_congestion[condition]
-    
+
     if rows.empty:
+        return pd.Series(dtype=float)
+
+    time_cols = [c for c in df_congestion.columns if "시" in c and "분" in c]
+    return rows[time_cols].max()
+
+def get_congestion_profile(station_name, day_type):
+    # "강남역"/"강남" 모두 같은 캐시를 쓰도록 이름을 먼저 정리
+    _mark("requested", "congestion")
+    return _congestion_profile(station_name.replace("역", ""), day_type)
+
+def get_real_congestion(station_name):
+    day_type, time_col = get_time_slot()
+
+    if time_col not in df_congestion.columns:
+        return 0, f"{day_type} {time_col} (운행종료)"
+
+    profile = get_congestion_profile(station_name, day_type)
+
+    if profile.empty:
         return -1, "데이터 없음"
-    
-    return rows[time_col].max(), f"{day_type} {time_col} 기준"
+
+    return profile[time_col], f"{day_type} {time_col} 기준"
 
 # (2) 도착 정보 (API)
+AIR_TTL_SEC = 30 * 60     # 대기 정보는 한 시간대(30분) 동안 재사용
+REQUEST_TIMEOUT_SEC = 5   # API가 멈춰도 예열 스레드가 같이 멈추지 않도록
+
+def _fetch_arrival(clean_station):
+    # 실시간 정보라 캐시/예열하지 않고 요청마다 새로 받음
+    # 학교 컴퓨터 secrets.toml 확인 필수!
+    KEY_SUBWAY = st.secrets["seoul"]["subway_key"]
+    url = f"http://swopenapi.seoul.go.kr/api/subway/{KEY_SUBWAY}/json/realtimeStationArrival/0/5/{clean_station}"
+    response = requests.get(url, timeout=REQUEST_TIMEOUT_SEC)
+    data = response.json()
+    if "realtimeArrivalList" in data:
+        return pd.DataFrame(data["realtimeArrivalList"])[["trainLineNm", "arvlMsg2", "recptnDt"]]
+    # INFO-200 = 진짜로 도착 정보가 없는 경우만 빈 표로 캐시, 나머지(인증/호출 한도 등)는 오류로 처리
+    code = data.get("code") or data.get("errorMessage", {}).get("code")
+    if code == "INFO-200":
+        return pd.DataFrame()
+    raise RuntimeError(f"지하철 도착 API 오류: {code} {data.get('message', '')}")
+
 def get_arrival(station):
     clean_station = station.replace("역", "")
     try:
-        # 학교 컴퓨터 secrets.toml 확인 필수!
-        KEY_SUBWAY = st.secrets["seoul"]["subway_key"]
-        url = f"http://swopenapi.seoul.go.kr/api/subway/{KEY_SUBWAY}/json/realtimeStationArrival/0/5/{clean_station}"
-        response = requests.get(url)
-        data = response.json()
-        if "realtimeArrivalList" in data:
-            return pd.DataFrame(data["realtimeArrivalList"])[["trainLineNm", "arvlMsg2", "recptnDt"]]
-        return pd.DataFrame()
+        return _fetch_arrival(clean_station)
     except:
         return pd.DataFrame()
 
 # (3) 미세먼지 (API + 족보 적용)
+@st.cache_data(ttl=AIR_TTL_SEC, show_spinner=False)
+def _fetch_city_air():
+    # 25개 구 전체를 한 번에 받아오므로 역과 상관없이 한 번만 호출
+    _mark("fetched", "air")
+    KEY_GENERAL = st.secrets["seoul"]["general_key"]
+    url = f"http://openapi.seoul.go.kr:8088/{KEY_GENERAL}/json/RealtimeCityAir/1/25/"
+    response = requests.get(url, timeout=REQUEST_TIMEOUT_SEC)
+    data = response.json()
+
+    if "RealtimeCityAir" in data:
+        return pd.DataFrame(data["RealtimeCityAir"]["row"])
+    # 오류 응답을 빈 표로 30분 동안 캐시하지 않도록 예외로 넘김
+    raise RuntimeError(f"대기 정보 API 오류: {data.get('RESULT', data)}")
+
 def get_gu_air_quality(station):
+    _mark("requested", "air")
     try:
-        KEY_GENERAL = st.secrets["seoul"]["general_key"]
-        url = f"http://openapi.seoul.go.kr:8088/{KEY_GENERAL}/json/RealtimeCityAir/1/25/"
-        response = requests.get(url)
-        data = response.json()
-        
-        if "RealtimeCityAir" in data:
-            df = pd.DataFrame(data["RealtimeCityAir"]["row"])
-            
+        df = _fetch_city_air()
+
+        if not df.empty:
             clean_station = station.replace("역", "")
             target_gu = STATION_TO_GU.get(clean_station, clean_station)
             
@@ -115,4 +170,227 @@ def calculate_discomfort_index(temp, humi):
     if di >= 80: return di, "매우 나쁨 (전원 불쾌) 🤬"
     elif di >= 75: return di, "나쁨 (50% 불쾌) 😠"
     elif di >= 68: return di, "보통 (10% 불쾌) 😐"
-    else: return di, "좋음 (쾌적) 😊"
\ No newline at end of file
+    else: return di, "좋음 (쾌적) 😊"
+
+# ==========================================
+# 4. 캐시 예열 (접속 기록 기반)
+# ==========================================
+ACCESS_LOG_PATH = "data/access_log.csv"
+ACCESS_LOG_COLUMNS = ["접속시각", "역", "요일구분", "시간대"]
+ACCESS_LOG_DAYS = 28      # 예측에 쓰는 최근 기록 기간 (오래된 기록은 예열 때마다 정리)
+WARMUP_TOP_N = 20         # 시간대마다 미리 불러올 역 개수
+WARMUP_LEAD_SEC = 30      # 시간대 시작 몇 초 전에 예열할지
+WARMUP_WORKERS = 4        # 동시에 예열할 역 개수
+
+_lock = threading.Lock()
+_log_lock = threading.Lock()  # 접속 기록 파일 전용 (줄이 섞이지 않도록)
+_warmed = {"slot": None, "stations": set()}
+_warmup_status = {"last_run": None, "stations": 0, "error": None}
+_metrics = {
+    "slot": None, "seen": set(), "requests": 0, "predicted": 0,
+    "cache": {kind: [0, 0] for kind in CACHE_KINDS},  # [적중, 조회]
+    "first_warm": [0.0, 0], "first_cold": [0.0, 0],  # [누적 초, 횟수]
+}
+
+def _slot_start(now):
+    # 30분 단위로 내림 (예: 8:47 -> 8:30)
+    return now.replace(minute=0 if now.minute < 30 else 30, second=0, microsecond=0)
+
+def _next_slot_start(now):
+    return _slot_start(now) + timedelta(minutes=30)
+
+# CSV에 있는 역만 기록/예측 (오타나 없는 역 이름으로 API를 부르지 않도록)
+KNOWN_STATIONS = set(df_congestion['출발역'])
+
+def _window_start(now):
+    # 이 날짜(포함) 이후의 기록만 예측에 씀
+    return (now - timedelta(days=ACCESS_LOG_DAYS)).date()
+
+def _read_access_log(now):
+    # 깨진 줄은 건너뛰고, 기간이 지났거나 없는 역은 버림
+    log = pd.read_csv(ACCESS_LOG_PATH, encoding="utf-8", on_bad_lines="skip")
+    dates = pd.to_datetime(log["접속시각"], errors="coerce").dt.date
+    keep = dates.notna() & (dates >= _window_start(now)) & log["역"].isin(KNOWN_STATIONS)
+    return log[keep], dates[keep], len(log)
+
+def _load_access_counts():
+    # (날짜, 요일구분, 시간대, 역) -> 접속 횟수
+    try:
+        log, dates, total = _read_access_log(datetime.now())
+        if len(log) < total:
+            log.to_csv(ACCESS_LOG_PATH, index=False, encoding="utf-8")
+        return Counter(zip(dates, log["요일구분"], log["시간대"], log["역"]))
+    except FileNotFoundError:
+        return Counter()
+    except Exception as e:
+        _warmup_status["error"] = f"접속 기록 읽기 실패: {e!r}"
+        return Counter()
+
+def _prune_access_counts(now):
+    # 서버가 오래 켜져 있어도 최근 ACCESS_LOG_DAYS일만 남도록 예열 때마다 정리
+    since = _window_start(now)
+    with _lock:
+        expired = [key for key in _access_counts if key[0] < since]
+        for key in expired:
+            del _access_counts[key]
+    if not expired:
+        return
+
+    # 하루가 지나 기록이 빠졌을 때만 파일도 같이 줄임
+    with _log_lock:
+        try:
+            log, _, total = _read_access_log(now)
+            if len(log) < total:
+                log.to_csv(ACCESS_LOG_PATH, index=False, encoding="utf-8")
+        except FileNotFoundError:
+            pass
+
+_access_counts = _load_access_counts()
+
+# (1) 접속 기록 + 적중률/첫 요청 지연 측정
+def begin_access():
+    # 요청 처리 전에 호출 -> 시작 시각을 돌려줌
+    _fetch_flags.requested = set()
+    _fetch_flags.fetched = set()
+    return time.perf_counter()
+
+def record_access(station, started):
+    elapsed = time.perf_counter() - started
+    requested = getattr(_fetch_flags, "requested", None) or set()
+    fetched = getattr(_fetch_flags, "fetched", None) or set()
+    _fetch_flags.requested = None
+    _fetch_flags.fetched = None
+
+    now = datetime.now()
+    clean_station = station.replace("역", "")
+    day_type, time_col = get_time_slot(now)
+    slot = _slot_start(now)
+
+    known = clean_station in KNOWN_STATIONS
+
+    with _lock:
+        if known:
+            _access_counts[(now.date(), day_type, time_col, clean_station)] += 1
+
+        if _metrics["slot"] != slot:
+            _metrics["slot"] = slot
+            _metrics["seen"] = set()
+
+        _metrics["requests"] += 1
+        if _warmed["slot"] == slot and clean_station in _warmed["stations"]:
+            _metrics["predicted"] += 1
+
+        for kind in requested:
+            stat = _metrics["cache"][kind]
+            stat[1] += 1
+            if kind not in fetched:
+                stat[0] += 1
+
+        # 시간대별로 그 역을 처음 찾은 사람의 대기 시간만 따로 모음
+        # 혼잡도/대기 정보를 하나도 새로 불러오지 않았을 때만 "캐시로 처리"로 봄 (도착 정보는 항상 새로 받음)
+        if clean_station not in _metrics["seen"]:
+            _metrics["seen"].add(clean_station)
+            bucket = _metrics["first_warm"] if not fetched else _metrics["first_cold"]
+            bucket[0] += elapsed
+            bucket[1] += 1
+
+        row = [now.strftime("%Y-%m-%d %H:%M:%S"), clean_station, day_type, time_col]
+
+    if not known:
+        return
+
+    # 파일 쓰기는 _lock 밖에서 (다른 세션의 집계/예측이 디스크를 기다리지 않도록)
+    with _log_lock:
+        try:
+            write_header = not os.path.exists(ACCESS_LOG_PATH)
+            pd.DataFrame([row], columns=ACCESS_LOG_COLUMNS).to_csv(
+                ACCESS_LOG_PATH, mode="a", header=write_header, index=False, encoding="utf-8")
+        except:
+            pass
+
+def get_cache_metrics():
+    with _lock:
+        requests_n = _metrics["requests"]
+        warm_sum, warm_n = _metrics["first_warm"]
+        cold_sum, cold_n = _metrics["first_cold"]
+        return {
+            "requests": requests_n,
+            # 요청한 역이 예열 대상이었던 비율 (예측 정확도)
+            "predicted_rate": _metrics["predicted"] / requests_n if requests_n else 0.0,
+            # 데이터 종류별 실제 캐시 적중률 (조회가 없으면 None)
+            "cache_hit_rate": {kind: hits / total if total else None
+                               for kind, (hits, total) in _metrics["cache"].items()},
+            "first_warm_ms": warm_sum / warm_n * 1000 if warm_n else None,
+            "first_cold_ms": cold_sum / cold_n * 1000 if cold_n else None,
+            "warmup_last_run": _warmup_status["last_run"],
+            "warmup_stations": _warmup_status["stations"],
+            "warmup_error": _warmup_status["error"],
+        }
+
+# (2) 다음 시간대 인기 역 예측
+def predict_top_stations(day_type, time_col, top_n=WARMUP_TOP_N, now=None):
+    since = _window_start(now or datetime.now())
+    counts = Counter()
+    with _lock:
+        for (date, d, t, station), n in _access_counts.items():
+            if date >= since and d == day_type and t == time_col and station in KNOWN_STATIONS:
+                counts[station] += n
+    return [station for station, _ in counts.most_common(top_n)]
+
+# (3) 예열 스케줄러 (백그라운드 스레드)
+def _warm_station(station, day_type):
+    get_congestion_profile(station, day_type)
+    get_gu_air_quality(station)
+
+def warm_up(slot):
+    day_type, time_col = get_time_slot(slot)
+    if time_col not in df_congestion.columns:
+        return []
+
+    _prune_access_counts(datetime.now())
+    stations = predict_top_stations(day_type, time_col)
+
+    # 예열이 끝나기 전에 들어온 요청도 예측 대상으로 집계되도록 먼저 기록
+    with _lock:
+        _warmed["slot"] = slot
+        _warmed["stations"] = set(stations)
+
+    with ThreadPoolExecutor(max_workers=WARMUP_WORKERS) as pool:
+        list(pool.map(lambda station: _warm_station(station, day_type), stations))
+    return stations
+
+def _current_module():
+    # Streamlit이 logic.py를 다시 로드하면 예전 스레드는 새 모듈의 상태(_warmed, _access_counts ...)를 봐야 함
+    return sys.modules.get(__name__) or _this_module
+
+def _warmup_loop():
+    while True:
+        mod = _current_module()
+        slot = mod._next_slot_start(datetime.now())
+        wait = (slot - timedelta(seconds=mod.WARMUP_LEAD_SEC) - datetime.now()).total_seconds()
+        if wait > 0:
+            time.sleep(wait)
+        # 기다리는 동안 다시 로드됐을 수 있으니 한 번 더 확인
+        mod = _current_module()
+        try:
+            stations = mod.warm_up(slot)
+            mod._warmup_status.update(last_run=datetime.now(), stations=len(stations), error=None)
+        except Exception as e:
+            mod._warmup_status.update(last_run=datetime.now(), stations=0, error=repr(e))
+        # 같은 시간대를 두 번 예열하지 않도록 시간대 시작까지 대기
+        time.sleep(max(0, (slot - datetime.now()).total_seconds()) + 1)
+
+WARMUP_THREAD_NAME = "air-subway-warmup"
+
+def start_warmup_scheduler():
+    # 세션이 여러 개여도, 캐시를 지우거나 모듈이 다시 로드돼도 서버 전체에서 한 번만 실행됨
+    # (이미 돌고 있는 스레드는 _current_module()로 새 모듈의 상태를 따라감)
+    with _lock:
+        for thread in threading.enumerate():
+            if thread.name == WARMUP_THREAD_NAME:
+                return thread
+        thread = threading.Thread(target=_warmup_loop, name=WARMUP_THREAD_NAME, daemon=True)
+        thread.start()
+        return thread
+
+_this_module = sys.modules[__name__]
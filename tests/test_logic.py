@@ -0,0 +1,161 @@
+import importlib
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+WEEKDAY_8AM = datetime(2026, 10, 19, 8, 10)  # 월요일
+
+
+class FixedDatetime(datetime):
+    current = WEEKDAY_8AM
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+@pytest.fixture
+def logic(monkeypatch, tmp_path):
+    # logic.py는 data/congestion_data.csv를 상대 경로로 읽음
+    monkeypatch.chdir(ROOT)
+    monkeypatch.syspath_prepend(str(ROOT))
+    module = importlib.import_module("logic")
+
+    monkeypatch.setattr(module, "ACCESS_LOG_PATH", str(tmp_path / "access_log.csv"))
+    monkeypatch.setattr(module, "datetime", FixedDatetime)
+    FixedDatetime.current = WEEKDAY_8AM
+
+    # 모듈 전역 상태 초기화
+    monkeypatch.setattr(module, "_access_counts", Counter())
+    monkeypatch.setattr(module, "_warmed", {"slot": None, "stations": set()})
+    monkeypatch.setattr(module, "_warmup_status", {"last_run": None, "stations": 0, "error": None})
+    monkeypatch.setattr(module, "_metrics", {
+        "slot": None, "seen": set(), "requests": 0, "predicted": 0,
+        "cache": {kind: [0, 0] for kind in module.CACHE_KINDS},
+        "first_warm": [0.0, 0], "first_cold": [0.0, 0],
+    })
+
+    # st.cache_data 대신 dict 캐시: 없을 때만 본문 실행 -> "fetched" 표시
+    profiles = {}
+
+    def fake_profile(clean_name, day_type):
+        if (clean_name, day_type) not in profiles:
+            module._mark("fetched", "congestion")
+            profiles[(clean_name, day_type)] = pd.Series({"8시00분": 50.0})
+        return profiles[(clean_name, day_type)]
+
+    air = []
+
+    def fake_city_air():
+        if not air:
+            module._mark("fetched", "air")
+            air.append(pd.DataFrame({"MSRSTN_NM": ["강남구"], "PM": [30], "FPM": [15], "CAI_GRD": ["좋음"]}))
+        return air[0]
+
+    monkeypatch.setattr(module, "_congestion_profile", fake_profile)
+    monkeypatch.setattr(module, "_fetch_city_air", fake_city_air)
+    return module
+
+
+def request(logic, station):
+    started = logic.begin_access()
+    logic.get_congestion_profile(station, "평일")
+    logic.get_gu_air_quality(station)
+    logic.record_access(station, started)
+
+
+def test_slot_rounding(logic):
+    assert logic._slot_start(datetime(2026, 10, 19, 8, 10, 5)) == datetime(2026, 10, 19, 8, 0)
+    assert logic._slot_start(datetime(2026, 10, 19, 8, 47)) == datetime(2026, 10, 19, 8, 30)
+    assert logic._next_slot_start(datetime(2026, 10, 19, 8, 47)) == datetime(2026, 10, 19, 9, 0)
+
+
+def test_hit_and_miss_counting(logic):
+    request(logic, "강남역")
+    request(logic, "강남")  # "역"을 떼고 같은 캐시를 씀
+
+    metrics = logic.get_cache_metrics()
+    assert metrics["requests"] == 2
+    assert metrics["cache_hit_rate"] == {"congestion": 0.5, "air": 0.5}
+    # 같은 시간대 두 번째 요청은 첫 요청 지연에 들어가지 않음
+    assert logic._metrics["first_cold"][1] == 1
+    assert logic._metrics["first_warm"][1] == 0
+
+
+def test_slot_rollover_resets_first_requests(logic):
+    request(logic, "강남")
+    FixedDatetime.current = WEEKDAY_8AM + timedelta(minutes=30)
+    request(logic, "강남")
+
+    # 새 시간대의 첫 요청이고, 모두 캐시에서 처리됨
+    assert logic._metrics["slot"] == datetime(2026, 10, 19, 8, 30)
+    assert logic._metrics["seen"] == {"강남"}
+    assert logic._metrics["first_cold"][1] == 1
+    assert logic._metrics["first_warm"][1] == 1
+
+
+def test_record_access_without_begin_access(logic):
+    logic.record_access("강남", logic.time.perf_counter())
+
+    metrics = logic.get_cache_metrics()
+    assert metrics["requests"] == 1
+    assert metrics["cache_hit_rate"] == {"congestion": None, "air": None}
+
+
+def test_unknown_station_is_not_logged(logic):
+    request(logic, "없는역")
+
+    assert logic._access_counts == Counter()
+    assert not Path(logic.ACCESS_LOG_PATH).exists()
+
+
+def test_known_station_is_logged(logic):
+    request(logic, "강남")
+
+    assert logic._access_counts == Counter({(WEEKDAY_8AM.date(), "평일", "8시00분", "강남"): 1})
+    log = pd.read_csv(logic.ACCESS_LOG_PATH, encoding="utf-8")
+    assert list(log["역"]) == ["강남"]
+
+
+def test_predict_ranks_and_truncates(logic):
+    today = WEEKDAY_8AM.date()
+    old = today - timedelta(days=logic.ACCESS_LOG_DAYS + 1)
+    logic._access_counts.update({
+        (today, "평일", "8시00분", "강남"): 5,
+        (today - timedelta(days=1), "평일", "8시00분", "서초"): 3,
+        (today, "평일", "8시00분", "서초"): 3,
+        (today, "평일", "8시00분", "잠실"): 4,
+        (today, "평일", "8시30분", "교대"): 99,  # 다른 시간대
+        (old, "평일", "8시00분", "역삼"): 99,    # 기간 지남
+        (today, "평일", "8시00분", "없는역"): 99,
+    })
+
+    assert logic.predict_top_stations("평일", "8시00분", top_n=2) == ["서초", "강남"]
+    assert logic.predict_top_stations("평일", "8시00분") == ["서초", "강남", "잠실"]
+
+
+def test_warm_up_prunes_and_warms_predicted_stations(logic):
+    today = WEEKDAY_8AM.date()
+    old = today - timedelta(days=logic.ACCESS_LOG_DAYS + 1)
+    logic._access_counts.update({
+        (today, "평일", "8시30분", "강남"): 2,
+        (old, "평일", "8시30분", "잠실"): 9,
+    })
+    slot = datetime(2026, 10, 19, 8, 30)
+
+    assert logic.warm_up(slot) == ["강남"]
+    assert logic._warmed == {"slot": slot, "stations": {"강남"}}
+    assert (old, "평일", "8시30분", "잠실") not in logic._access_counts
+
+    # 예열된 역의 첫 요청은 API 호출 없이 처리됨
+    FixedDatetime.current = slot + timedelta(minutes=1)
+    request(logic, "강남")
+    metrics = logic.get_cache_metrics()
+    assert metrics["predicted_rate"] == 1.0
+    assert metrics["cache_hit_rate"] == {"congestion": 1.0, "air": 1.0}
+    assert logic._metrics["first_warm"][1] == 1